@@ -9,8 +9,17 @@ from .endpoints import OfferEndpoints
 class DuffelClient:
     """Client for interacting with the Duffel API."""
     
-    def __init__(self, logger: logging.Logger, timeout: float = 30.0):
-        """Initialize the Duffel API client."""
+    def __init__(
+        self,
+        logger: logging.Logger,
+        timeout: float = 60.0,
+        transport: httpx.AsyncBaseTransport | None = None
+    ):
+        """Initialize the Duffel API client.
+        
+        `transport` replaces the network transport, e.g. with an
+        httpx.MockTransport in tests.
+        """
         self.logger = logger
         self.timeout = timeout
         self._token = get_api_token()
@@ -19,7 +28,7 @@ class DuffelClient:
         # Headers setup
         self.headers = {
             "Accept": "application/json",
-            "Accept-Encoding": "gzip",
+            "Accept-Encoding": "br, gzip",
             "Duffel-Version": "v2",
             "Authorization": f"Bearer {self._token}",
             "Content-Type": "application/json"
@@ -28,8 +37,19 @@ class DuffelClient:
         self.logger.info(f"API key starts with: {self._token[:8] if self._token else None}")
         self.logger.info(f"Using base URL: {self.base_url}")
         
+        # Shared HTTP client so connections are pooled across requests;
+        # HTTP/2 multiplexes concurrent calls over a single TLS connection
+        self._http = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            timeout=httpx.Timeout(self.timeout),
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            transport=transport
+        )
+        
         # Initialize endpoints
-        self.offers = OfferEndpoints(self.base_url, self.headers, self.logger)
+        self.offers = OfferEndpoints(self._http, self.logger)
 
     async def __aenter__(self):
         """Async context manager entry."""
@@ -39,10 +59,23 @@ class DuffelClient:
         """Async context manager exit."""
         pass
 
+    async def aclose(self):
+        """Close the shared HTTP client and its pooled connections."""
+        await self._http.aclose()
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop every cached offer request response."""
+        OfferEndpoints.clear_cache()
+
     async def create_offer_request(self, **kwargs) -> Dict[str, Any]:
         """Create an offer request."""
         return await self.offers.create_offer_request(**kwargs)
 
+    async def list_offers(self, offer_request_id: str, **kwargs) -> List[Dict[str, Any]]:
+        """List the offers of an offer request."""
+        return await self.offers.list_offers(offer_request_id, **kwargs)
+
     async def get_offer(self, offer_id: str) -> Dict[str, Any]:
         """Get offer details."""
         return await self.offers.get_offer(offer_id) 
\ No newline at end of file
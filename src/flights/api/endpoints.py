@@ -1,17 +1,113 @@
 """Duffel API endpoint handlers."""
 
-from typing import Dict, Any, List
+from typing import Dict, List, Optional, Tuple
+import asyncio
 import logging
+import random
+import threading
+import time
 import httpx
+import orjson
+from cachetools import TTLCache
+
+# Offer request responses are reused for identical searches within this window
+CACHE_TTL_SECONDS = 300
+CACHE_MAX_ENTRIES = 512
+
+# Shared by every client in the process; TTLCache itself is not thread-safe.
+# Expiry runs on the monotonic clock, immune to wall-clock adjustments
+_CACHE = TTLCache(maxsize=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, timer=time.monotonic)
+_CACHE_LOCK = threading.Lock()
+
+# Transient upstream failures are retried with exponential backoff and jitter
+RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+MAX_ATTEMPTS = 4
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 30.0
+
+# Passenger entries are identical, so every request shares one read-only dict
+_ADULT = {"type": "adult"}
+
+
+def _parse(response: httpx.Response) -> Dict:
+    """Decode a JSON response body straight from its raw bytes."""
+    return orjson.loads(response.content)
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter for the given zero-based attempt."""
+    return min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt) + random.uniform(0, RETRY_BASE_DELAY)
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds requested by a Retry-After header, if it is given in seconds."""
+    try:
+        return min(RETRY_MAX_DELAY, max(0.0, float(response.headers["Retry-After"])))
+    except (KeyError, ValueError):
+        return None
+
 
 class OfferEndpoints:
     """Offer-related API endpoints."""
     
-    def __init__(self, base_url: str, headers: Dict, logger: logging.Logger):
-        self.base_url = base_url
-        self.headers = headers
+    def __init__(self, http: httpx.AsyncClient, logger: logging.Logger):
+        self.http = http
         self.logger = logger
 
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop every cached offer request response."""
+        with _CACHE_LOCK:
+            _CACHE.clear()
+
+    @staticmethod
+    def _cache_key(
+        slices: List[Dict],
+        cabin_class: str,
+        adult_count: int,
+        max_connections: Optional[int],
+        return_offers: bool,
+        supplier_timeout: int
+    ) -> Tuple:
+        """Build a hashable cache key for an offer request."""
+        def time_range(spec: Optional[Dict]) -> Optional[Tuple[str, str]]:
+            return (spec["from"], spec["to"]) if spec else None
+
+        legs = tuple(
+            (
+                s["origin"],
+                s["destination"],
+                s["departure_date"],
+                time_range(s.get("departure_time")),
+                time_range(s.get("arrival_time"))
+            )
+            for s in slices
+        )
+        return (cabin_class, adult_count, max_connections, return_offers, supplier_timeout, legs)
+
+    async def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request, retrying timeouts and transient upstream errors."""
+        for attempt in range(MAX_ATTEMPTS):
+            try:
+                response = await self.http.request(method, url, **kwargs)
+                response.raise_for_status()
+                return response
+            except httpx.TimeoutException as e:
+                if attempt == MAX_ATTEMPTS - 1:
+                    raise
+                delay = _backoff_delay(attempt)
+                error = e
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in RETRY_STATUS_CODES or attempt == MAX_ATTEMPTS - 1:
+                    raise
+                delay = _retry_after(e.response)
+                if delay is None:
+                    delay = _backoff_delay(attempt)
+                error = e
+            
+            self.logger.warning("Retrying %s %s in %.2fs after error: %s", method, url, delay, error)
+            await asyncio.sleep(delay)
+
     async def create_offer_request(
         self,
         slices: List[Dict],
@@ -23,11 +119,21 @@ class OfferEndpoints:
     ) -> Dict:
         """Create a flight offer request."""
         try:
+            # Serve repeated searches before building any request payload
+            cache_key = self._cache_key(
+                slices, cabin_class, adult_count, max_connections, return_offers, supplier_timeout
+            )
+            with _CACHE_LOCK:
+                cached = _CACHE.get(cache_key)
+            if cached is not None:
+                self.logger.info("Using cached offer request %s", cached["request_id"])
+                return cached
+
             # Format request data
             request_data = {
                 "data": {
                     "slices": slices,
-                    "passengers": [{"type": "adult"} for _ in range(adult_count)],
+                    "passengers": [_ADULT] * adult_count,
                     "cabin_class": cabin_class,
                 }
             }
@@ -40,46 +146,71 @@ class OfferEndpoints:
                 "supplier_timeout": supplier_timeout
             }
 
-            async with httpx.AsyncClient(timeout=httpx.Timeout(60.0)) as client:
-                self.logger.info(f"Creating offer request with data: {request_data}")
-                response = await client.post(
-                    f"{self.base_url}/offer_requests",
-                    headers=self.headers,
-                    params=params,
-                    json=request_data
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                request_id = data["data"]["id"]
-                offers = data["data"].get("offers", [])
-                
-                self.logger.info(f"Created offer request with ID: {request_id}")
-                self.logger.info(f"Received {len(offers)} offers")
-                
-                return {
-                    "request_id": request_id,
-                    "offers": offers
+            self.logger.info("Creating offer request with data: %s", request_data)
+            # Serialized once and reused by every retry attempt; Content-Type
+            # is already set on the shared client headers
+            response = await self._send(
+                "POST",
+                "/offer_requests",
+                params=params,
+                content=orjson.dumps(request_data)
+            )
+            data = _parse(response)
+            
+            request_id = data["data"]["id"]
+            offers = data["data"].get("offers") or []
+            
+            self.logger.info("Created offer request with ID: %s", request_id)
+            # Without embedded offers, list_offers logs the count it fetches
+            if return_offers:
+                self.logger.info("Received %d offers", len(offers))
+            
+            result = {
+                "request_id": request_id,
+                "offers": offers
+            }
+            with _CACHE_LOCK:
+                _CACHE[cache_key] = result
+            return result
+
+        except Exception as e:
+            self.logger.error("Error creating offer request: %s", e)
+            raise
+
+    async def list_offers(
+        self,
+        offer_request_id: str,
+        limit: int = 50,
+        sort: str = "total_amount"
+    ) -> List[Dict]:
+        """List the offers of an offer request, at most `limit` of them in `sort` order."""
+        try:
+            response = await self._send(
+                "GET",
+                "/offers",
+                params={
+                    "offer_request_id": offer_request_id,
+                    "limit": limit,
+                    "sort": sort
                 }
+            )
+            offers = _parse(response)["data"]
+            
+            self.logger.info("Listed %d offers for offer request %s", len(offers), offer_request_id)
+            return offers
 
         except Exception as e:
-            error_msg = f"Error creating offer request: {str(e)}"
-            self.logger.error(error_msg)
+            self.logger.error("Error listing offers for %s: %s", offer_request_id, e)
             raise
 
     async def get_offer(self, offer_id: str) -> Dict:
         """Get details of a specific offer."""
         try:
-            if not offer_id.startswith("off_"):
+            if offer_id[:4] != "off_":
                 raise ValueError("Invalid offer ID format - must start with 'off_'")
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/offers/{offer_id}",
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                return response.json()
+            response = await self._send("GET", f"/offers/{offer_id}")
+            return _parse(response)
         except Exception as e:
-            self.logger.error(f"Error getting offer {offer_id}: {str(e)}")
+            self.logger.error("Error getting offer %s: %s", offer_id, e)
             raise 
\ No newline at end of file
@@ -1,5 +1,6 @@
 """Configuration package."""
 
 from .api import DUFFEL_API_URL, DUFFEL_API_VERSION, get_api_token
+from .output import get_json_options
 
-__all__ = ['DUFFEL_API_URL', 'DUFFEL_API_VERSION', 'get_api_token'] 
\ No newline at end of file
+__all__ = ['DUFFEL_API_URL', 'DUFFEL_API_VERSION', 'get_api_token', 'get_json_options'] 
\ No newline at end of file
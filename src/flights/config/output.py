@@ -0,0 +1,12 @@
+"""Tool output configuration."""
+
+import os
+import orjson
+
+def get_json_options() -> int:
+    """Get orjson options for tool responses.
+    
+    Responses are compact unless FLIGHTS_PRETTY is set, which indents them
+    for easier reading while debugging.
+    """
+    return orjson.OPT_INDENT_2 if os.getenv("FLIGHTS_PRETTY") else 0
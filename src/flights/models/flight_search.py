@@ -1,13 +1,24 @@
 """Flight search models."""
 
-from .search import FlightSearch
+from .search import FlightSearch, FlightSearchBase, OneWayFlight, RoundTripFlight, MultiCityFlight
 from .multi_city import MultiCityRequest
 from .segments import FlightSegment
-from .offers import OfferDetails
+from .offers import OfferDetails, OfferId
+from .responses import ConnectionOut, SliceOut, PriceOut, OfferOut, SearchResponse
 
 __all__ = [
     'FlightSearch',
+    'FlightSearchBase',
+    'OneWayFlight',
+    'RoundTripFlight',
+    'MultiCityFlight',
     'MultiCityRequest',
     'FlightSegment',
     'OfferDetails',
+    'OfferId',
+    'ConnectionOut',
+    'SliceOut',
+    'PriceOut',
+    'OfferOut',
+    'SearchResponse',
 ] 
\ No newline at end of file
@@ -1,12 +1,13 @@
 """Multi-city flight search models."""
 
-from typing import Optional, List, Literal
-from pydantic import BaseModel, Field
+from typing import List, Literal
+from pydantic import BaseModel, ConfigDict, Field
 from .time_specs import TimeSpec
 from .segments import FlightSegment
 
 class MultiCityRequest(BaseModel):
     """Model for multi-city flight search."""
+    model_config = ConfigDict(frozen=True)
     type: Literal["multi_city"]
     segments: List[FlightSegment] = Field(..., min_items=2, description="Flight segments")
     cabin_class: str = Field("economy", description="Cabin class")
@@ -1,7 +1,12 @@
 """Offer-related models."""
 
-from pydantic import BaseModel, Field
+from typing import Annotated
+from pydantic import BaseModel, ConfigDict, Field
+
+# Duffel offer identifier, usable directly as a tool parameter type
+OfferId = Annotated[str, Field(description="The ID of the offer to get details for", pattern=r"^off_[A-Za-z0-9]+$")]
 
 class OfferDetails(BaseModel):
     """Model for getting detailed offer information."""
-    offer_id: str = Field(..., description="The ID of the offer to get details for") 
\ No newline at end of file
+    model_config = ConfigDict(frozen=True)
+    offer_id: OfferId
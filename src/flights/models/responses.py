@@ -0,0 +1,44 @@
+"""Formatted search response models."""
+
+from dataclasses import dataclass
+from typing import List
+
+@dataclass(slots=True)
+class ConnectionOut:
+    """Layover between two consecutive segments of a slice."""
+    airport: str | None
+    arrival: str | None
+    departure: str | None
+    duration: str | None
+
+@dataclass(slots=True)
+class SliceOut:
+    """Essential details of one slice of an offer."""
+    origin: str
+    destination: str
+    departure: str | None
+    arrival: str | None
+    duration: str | None
+    carrier: str | None
+    stops: int
+    stops_description: str
+    connections: List[ConnectionOut]
+
+@dataclass(slots=True)
+class PriceOut:
+    """Total price of an offer."""
+    amount: str | None
+    currency: str | None
+
+@dataclass(slots=True)
+class OfferOut:
+    """Essential details of a flight offer."""
+    offer_id: str | None
+    price: PriceOut
+    slices: List[SliceOut]
+
+@dataclass(slots=True)
+class SearchResponse:
+    """Formatted result of an offer request."""
+    request_id: str
+    offers: List[OfferOut]
@@ -1,19 +1,38 @@
 """Flight search models."""
 
-from typing import Optional, List
-from pydantic import BaseModel, Field
+from typing import Annotated, List, Literal, Union
+from pydantic import BaseModel, ConfigDict, Field
 from .time_specs import TimeSpec
 
-class FlightSearch(BaseModel):
-    """Model for flight search parameters."""
-    type: str = Field(..., description="Type of flight: 'one_way', 'round_trip', or 'multi_city'")
+class FlightSearchBase(BaseModel):
+    """Parameters shared by every flight search type."""
+    model_config = ConfigDict(frozen=True)
     origin: str = Field(..., description="Origin airport code")
     destination: str = Field(..., description="Destination airport code")
     departure_date: str = Field(..., description="Departure date (YYYY-MM-DD)")
-    return_date: str | None = Field(None, description="Return date for round trips (YYYY-MM-DD)")
     departure_time: TimeSpec | None = Field(None, description="Preferred departure time range")
     arrival_time: TimeSpec | None = Field(None, description="Preferred arrival time range")
     cabin_class: str = Field("economy", description="Cabin class (economy, business, first)")
     adults: int = Field(1, description="Number of adult passengers")
     max_connections: int = Field(None, description="Maximum number of connections (0 for non-stop)")
-    additional_stops: Optional[List[dict]] = Field(None, description="Additional stops for multi-city trips") 
\ No newline at end of file
+
+class OneWayFlight(FlightSearchBase):
+    """Model for one-way flight search parameters."""
+    type: Literal["one_way"] = Field(..., description="Type of flight")
+
+class RoundTripFlight(FlightSearchBase):
+    """Model for round-trip flight search parameters."""
+    type: Literal["round_trip"] = Field(..., description="Type of flight")
+    return_date: str = Field(..., description="Return date for round trips (YYYY-MM-DD)")
+
+class MultiCityFlight(FlightSearchBase):
+    """Model for multi-city flight search parameters."""
+    type: Literal["multi_city"] = Field(..., description="Type of flight")
+    additional_stops: List[dict] = Field(..., min_length=1, description="Additional stops for multi-city trips")
+    price_legs_separately: bool = Field(False, description="For multi-city trips, price each leg as a separate one-way search")
+
+# The "type" field selects the model, so validation dispatches in pydantic-core
+FlightSearch = Annotated[
+    Union[OneWayFlight, RoundTripFlight, MultiCityFlight],
+    Field(discriminator="type")
+]
@@ -1,9 +1,14 @@
 """Flight segment models."""
 
-from pydantic import BaseModel, Field
+from typing import Annotated
+from pydantic import Field
+from typing_extensions import TypedDict
 
-class FlightSegment(BaseModel):
+# A TypedDict rather than a BaseModel: segments are only read back to build
+# slices, so validating into plain dicts skips a model instance per segment
+# while keeping the same JSON schema
+class FlightSegment(TypedDict):
     """Model for a single flight segment in a multi-city trip."""
-    origin: str = Field(..., description="Origin airport code")
-    destination: str = Field(..., description="Destination airport code") 
-    departure_date: str = Field(..., description="Departure date (YYYY-MM-DD)") 
\ No newline at end of file
+    origin: Annotated[str, Field(description="Origin airport code")]
+    destination: Annotated[str, Field(description="Destination airport code")]
+    departure_date: Annotated[str, Field(description="Departure date (YYYY-MM-DD)")]
@@ -1,8 +1,12 @@
 """Time specification models."""
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+# HH:MM time format, checked natively by pydantic-core in each field's validator
+TIME_PATTERN = "^([0-1]?[0-9]|2[0-3]):[0-5][0-9]$"
 
 class TimeSpec(BaseModel):
     """Model for time range specification."""
-    from_time: str = Field(..., description="Start time (HH:MM)", pattern="^([0-1]?[0-9]|2[0-3]):[0-5][0-9]$")
-    to_time: str = Field(..., description="End time (HH:MM)", pattern="^([0-1]?[0-9]|2[0-3]):[0-5][0-9]$") 
\ No newline at end of file
+    model_config = ConfigDict(frozen=True)
+    from_time: str = Field(..., description="Start time (HH:MM)", pattern=TIME_PATTERN)
+    to_time: str = Field(..., description="End time (HH:MM)", pattern=TIME_PATTERN)
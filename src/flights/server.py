@@ -1,14 +1,25 @@
 """Server initialization for find-flights MCP."""
 
+import asyncio
 import logging
 from .services.search import mcp
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+def _install_uvloop() -> None:
+    """Run the server on uvloop when the optional dependency is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("Using uvloop event loop")
+
 def main():
     """Entry point for the find-flights-mcp application."""
     logger.info("Starting Find Flights MCP server")
+    _install_uvloop()
     try:
         mcp.run(transport='stdio')
         logger.info("Server initialized successfully")
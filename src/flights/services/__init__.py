@@ -1,5 +1,5 @@
 """Flight search services."""
 
-from .search import search_flights, get_offer_details, search_multi_city
+from .search import search_flights, get_offer_details, get_offer_details_bulk, search_multi_city
 
-__all__ = ['search_flights', 'get_offer_details', 'search_multi_city'] 
\ No newline at end of file
+__all__ = ['search_flights', 'get_offer_details', 'get_offer_details_bulk', 'search_multi_city'] 
\ No newline at end of file
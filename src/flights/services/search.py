@@ -1,280 +1,331 @@
 """Flight search tools using Duffel API."""
 
+import asyncio
 import logging
-from typing import Dict
-import json
+import threading
+import time
+from contextlib import asynccontextmanager
+from itertools import islice, pairwise
+from operator import itemgetter
+from typing import Annotated, AsyncIterator, Awaitable, Callable, Dict, Final, List, Tuple
+import orjson
+from cachetools import TTLCache
 from mcp.server.fastmcp import FastMCP
+from pydantic import Field
 
 # Import all models through flight_search
 from ..models.flight_search import (
     FlightSearch,
+    FlightSearchBase,
+    RoundTripFlight,
+    MultiCityFlight,
     MultiCityRequest,
-    OfferDetails
+    OfferId,
+    ConnectionOut,
+    SliceOut,
+    PriceOut,
+    OfferOut,
+    SearchResponse
 )
 from ..models.time_specs import TimeSpec
 from ..api import DuffelClient
+from ..config import get_json_options
 
-# Set up logging
+# Set up logging; tracebacks are only formatted when debugging
 logger = logging.getLogger(__name__)
 
-# Initialize FastMCP server and API client
-mcp = FastMCP("find-flights-mcp")
-flight_client = DuffelClient(logger)
+# Shared API client, created on first use and closed once no session is left
+_flight_client: DuffelClient | None = None
+_active_sessions = 0
+
+def _get_client() -> DuffelClient:
+    """Return the shared Duffel client, creating it on first use."""
+    global _flight_client
+    if _flight_client is None:
+        _flight_client = DuffelClient(logger)
+    return _flight_client
+
+@asynccontextmanager
+async def _lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Release the pooled Duffel connections when the last session ends.
+    
+    FastMCP enters the lifespan once per session: once for stdio, but once
+    per connection for SSE and streamable HTTP. The shared client is only
+    closed when no other session can still be using it.
+    """
+    global _flight_client, _active_sessions
+    _active_sessions += 1
+    try:
+        yield
+    finally:
+        _active_sessions -= 1
+        if _active_sessions == 0 and _flight_client is not None:
+            client, _flight_client = _flight_client, None
+            await client.aclose()
+
+# Initialize FastMCP server
+mcp = FastMCP("find-flights-mcp", lifespan=_lifespan)
+
+# Serialization options for every tool response
+_JSON_OPTIONS = get_json_options()
+
+# Bulk offer lookups are bounded in size and in concurrent upstream calls
+BULK_OFFER_MAX_IDS = 50
+BULK_OFFER_CONCURRENCY = 10
+
+# Formatted results of recent searches, keyed by tool name and parameters;
+# locked and timed like the offer request cache in api/endpoints.py
+_SEARCH_CACHE: TTLCache = TTLCache(maxsize=256, ttl=120, timer=time.monotonic)
+_SEARCH_CACHE_LOCK = threading.Lock()
+
+# C-level accessors for keys every Duffel slice is guaranteed to carry
+_slice_airports = itemgetter('origin', 'destination')
+_iata_code = itemgetter('iata_code')
+
+# Default time window for slices, shared rather than rebuilt per slice.
+# A plain dict because orjson cannot serialize a MappingProxyType; it must
+# never be mutated
+_FULL_DAY: Final[Dict[str, str]] = {"from": "00:00", "to": "23:59"}
 
 
 def _create_slice(origin: str, destination: str, date: str, 
                  departure_time: TimeSpec | None = None,
                  arrival_time: TimeSpec | None = None) -> Dict:
     """Helper to create a slice with time ranges."""
-    slice_data = {
+    return {
         "origin": origin,
         "destination": destination,
         "departure_date": date,
-        "departure_time": {
-            "from": "00:00",
-            "to": "23:59"
-        },
-        "arrival_time": {
-            "from": "00:00",
-            "to": "23:59"
-        }
+        "departure_time": (
+            {"from": departure_time.from_time, "to": departure_time.to_time}
+            if departure_time else _FULL_DAY
+        ),
+        "arrival_time": (
+            {"from": arrival_time.from_time, "to": arrival_time.to_time}
+            if arrival_time else _FULL_DAY
+        )
     }
+
+def _dumps(data) -> str:
+    """Serialize a tool response to JSON text."""
+    return orjson.dumps(data, option=_JSON_OPTIONS).decode()
+
+def _format_connection(arriving: Dict, departing: Dict) -> ConnectionOut:
+    """Describe the layover between two consecutive segments."""
+    airport = arriving.get('destination')
+    return ConnectionOut(
+        airport=airport.get('iata_code') if airport else None,
+        arrival=arriving.get('arriving_at'),
+        departure=departing.get('departing_at'),
+        duration=departing.get('duration')
+    )
+
+def _format_slice(slice: Dict) -> SliceOut:
+    """Reduce an offer slice with at least one segment to its essential details."""
+    segments = slice['segments']
+    first, last = segments[0], segments[-1]
+    stops = len(segments) - 1
+    carrier = first.get('marketing_carrier')
+    origin, destination = _slice_airports(slice)
+    return SliceOut(
+        origin=_iata_code(origin),
+        destination=_iata_code(destination),
+        departure=first.get('departing_at'),  # First segment departure
+        arrival=last.get('arriving_at'),      # Last segment arrival
+        duration=slice.get('duration'),
+        carrier=carrier.get('name') if carrier else None,
+        stops=stops,
+        stops_description='Non-stop' if stops == 0 else f'{stops} stop{"s" if stops > 1 else ""}',
+        connections=[
+            _format_connection(arriving, departing)
+            for arriving, departing in pairwise(segments)
+        ]
+    )
+
+def _format_offer(offer: Dict) -> OfferOut:
+    """Reduce a Duffel offer to its essential details."""
+    offer_get = offer.get
+    return OfferOut(
+        offer_id=offer_get('id'),
+        price=PriceOut(amount=offer_get('total_amount'), currency=offer_get('total_currency')),
+        # Slices without segments carry nothing worth reporting
+        slices=[_format_slice(slice) for slice in offer_get('slices') or () if slice.get('segments')]
+    )
+
+def _format_response(response: Dict, limit: int) -> SearchResponse:
+    """Reduce an offer request response to the essential offer details."""
+    # Limit the number of offers to manage response size
+    return SearchResponse(
+        request_id=response['request_id'],
+        offers=[_format_offer(offer) for offer in islice(response.get('offers') or (), limit)]
+    )
+
+async def _search_cheapest(
+    client: DuffelClient,
+    slices: List[Dict],
+    params: FlightSearchBase | MultiCityRequest,
+    limit: int,
+    supplier_timeout: int
+) -> Dict:
+    """Create an offer request and fetch only its `limit` cheapest offers.
+    
+    Duffel would otherwise embed every offer in the offer request response,
+    often hundreds of them, only for all but the first few to be discarded.
+    """
+    offer_request = await client.create_offer_request(
+        slices=slices,
+        cabin_class=params.cabin_class,
+        adult_count=params.adults,
+        max_connections=params.max_connections,
+        return_offers=False,
+        supplier_timeout=supplier_timeout
+    )
+    offers = await client.list_offers(offer_request['request_id'], limit=limit, sort="total_amount")
+    return {'request_id': offer_request['request_id'], 'offers': offers}
+
+def _format_search_response(response: Dict, limit: int) -> str:
+    """Format an offer request response as the JSON text returned by the search tools."""
+    return _dumps(_format_response(response, limit))
+
+async def _cached_search(key: Tuple, compute: Callable[[], Awaitable[str]]) -> str:
+    """Return the cached search result for `key`, computing and storing it on a miss."""
+    with _SEARCH_CACHE_LOCK:
+        cached = _SEARCH_CACHE.get(key)
+    if cached is not None:
+        return cached
     
-    if departure_time:
-        slice_data["departure_time"] = {
-            "from": departure_time.from_time,
-            "to": departure_time.to_time
-        }
+    result = await compute()
+    with _SEARCH_CACHE_LOCK:
+        _SEARCH_CACHE[key] = result
+    return result
+
+def _flight_slices(params: FlightSearch) -> List[Dict]:
+    """Build the Duffel slices for a flight search."""
+    times = (params.departure_time, params.arrival_time)
     
-    if arrival_time:
-        slice_data["arrival_time"] = {
-            "from": arrival_time.from_time,
-            "to": arrival_time.to_time
-        }
+    # Collect (origin, destination, date) legs based on flight type
+    match params:
+        case RoundTripFlight():
+            legs = [
+                (params.origin, params.destination, params.departure_date),
+                (params.destination, params.origin, params.return_date)
+            ]
+        case MultiCityFlight():
+            legs = [(params.origin, params.destination, params.departure_date)] + [
+                (stop["origin"], stop["destination"], stop["departure_date"])
+                for stop in params.additional_stops
+            ]
+            # Multi-city legs always search the full day
+            times = (None, None)
+        case _:
+            legs = [(params.origin, params.destination, params.departure_date)]
     
-    return slice_data
+    return [_create_slice(*leg, *times) for leg in legs]
 
 @mcp.tool()
 async def search_flights(params: FlightSearch) -> str:
     """Search for flights based on parameters."""
     try:
-        slices = []
-        
-        # Build slices based on flight type
-        if params.type == "one_way":
-            slices = [_create_slice(
-                params.origin, 
-                params.destination, 
-                params.departure_date,
-                params.departure_time,
-                params.arrival_time
-            )]
-        elif params.type == "round_trip":
-            if not params.return_date:
-                raise ValueError("Return date required for round-trip flights")
-            slices = [
-                _create_slice(
-                    params.origin,
-                    params.destination,
-                    params.departure_date,
-                    params.departure_time,
-                    params.arrival_time
-                ),
-                _create_slice(
-                    params.destination,
-                    params.origin,
-                    params.return_date,
-                    params.departure_time,
-                    params.arrival_time
+        # Price each leg as its own request, issued concurrently, fetching
+        # only its cheapest offers; these results are not cached
+        if isinstance(params, MultiCityFlight) and params.price_legs_separately:
+            async with _get_client() as client:
+                responses = await asyncio.gather(
+                    *(
+                        _search_cheapest(client, [leg], params, limit=50, supplier_timeout=15000)
+                        for leg in _flight_slices(params)
+                    ),
+                    return_exceptions=True
                 )
-            ]
-        elif params.type == "multi_city":
-            if not params.additional_stops:
-                raise ValueError("Additional stops required for multi-city flights")
-            
-            # First leg
-            slices.append({
-                "origin": params.origin,
-                "destination": params.destination,
-                "departure_date": params.departure_date,
-                "departure_time": {
-                    "from": "00:00",
-                    "to": "23:59"
-                },
-                "arrival_time": {
-                    "from": "00:00",
-                    "to": "23:59"
-                }
-            })
             
-            # Additional legs
-            for stop in params.additional_stops:
-                slices.append({
-                    "origin": stop["origin"],
-                    "destination": stop["destination"],
-                    "departure_date": stop["departure_date"],
-                    "departure_time": {
-                        "from": "00:00",
-                        "to": "23:59"
-                    },
-                    "arrival_time": {
-                        "from": "00:00",
-                        "to": "23:59"
-                    }
-                })
-        
-        # Use async context manager
-        async with flight_client as client:
-            response = await client.create_offer_request(
-                slices=slices,
-                cabin_class=params.cabin_class,
-                adult_count=params.adults,
-                max_connections=params.max_connections,
-                return_offers=True,
-                supplier_timeout=15000
-            )
-        
-        # Format the response
-        formatted_response = {
-            'request_id': response['request_id'],
-            'offers': []
-        }
+            legs = [
+                {'error': str(response)} if isinstance(response, BaseException)
+                else _format_response(response, 50)
+                for response in responses
+            ]
+            return _dumps({'legs': legs})
         
-        # Get all offers (limit to 10 to manage response size)
-        for offer in response.get('offers', [])[:50]:  # Keep the slice to limit offers
-            offer_details = {
-                'offer_id': offer.get('id'),
-                'price': {
-                    'amount': offer.get('total_amount'),
-                    'currency': offer.get('total_currency')
-                },
-                'slices': []
-            }
-            
-            # Only include essential slice details
-            for slice in offer.get('slices', []):
-                segments = slice.get('segments', [])
-                if segments:  # Check if there are any segments
-                    slice_details = {
-                        'origin': slice['origin']['iata_code'],
-                        'destination': slice['destination']['iata_code'],
-                        'departure': segments[0].get('departing_at'),  # First segment departure
-                        'arrival': segments[-1].get('arriving_at'),    # Last segment arrival
-                        'duration': slice.get('duration'),
-                        'carrier': segments[0].get('marketing_carrier', {}).get('name'),
-                        'stops': len(segments) - 1,
-                        'stops_description': 'Non-stop' if len(segments) == 1 else f'{len(segments) - 1} stop{"s" if len(segments) - 1 > 1 else ""}',
-                        'connections': []
-                    }
-                    
-                    # Add connection information if there are multiple segments
-                    if len(segments) > 1:
-                        for i in range(len(segments)-1):
-                            connection = {
-                                'airport': segments[i].get('destination', {}).get('iata_code'),
-                                'arrival': segments[i].get('arriving_at'),
-                                'departure': segments[i+1].get('departing_at'),
-                                'duration': segments[i+1].get('duration')
-                            }
-                            slice_details['connections'].append(connection)
-                    
-                    offer_details['slices'].append(slice_details)
-            
-            formatted_response['offers'].append(offer_details)
+        async def search() -> str:
+            # Use async context manager
+            async with _get_client() as client:
+                response = await _search_cheapest(
+                    client, _flight_slices(params), params, limit=50, supplier_timeout=15000
+                )
+            return _format_search_response(response, 50)
         
-        return json.dumps(formatted_response, indent=2)
+        return await _cached_search(("search_flights", params.model_dump_json()), search)
             
     except Exception as e:
-        logger.error(f"Error searching flights: {str(e)}", exc_info=True)
+        logger.error("Error searching flights: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         raise
 
 @mcp.tool()
-async def get_offer_details(params: OfferDetails) -> str:
+async def get_offer_details(offer_id: OfferId) -> str:
     """Get detailed information about a specific flight offer."""
     try:
-        async with flight_client as client:
+        async with _get_client() as client:
             response = await client.get_offer(
-                offer_id=params.offer_id
+                offer_id=offer_id
+            )
+            return _dumps(response)
+            
+    except Exception as e:
+        logger.error("Error getting offer details: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
+        raise
+
+@mcp.tool()
+async def get_offer_details_bulk(
+    offer_ids: Annotated[
+        List[OfferId],
+        Field(min_length=1, max_length=BULK_OFFER_MAX_IDS, description="IDs of the offers to get details for")
+    ]
+) -> str:
+    """Get detailed information about several flight offers at once."""
+    try:
+        # Fetch each distinct offer once, concurrently over the shared
+        # connection pool, a few at a time
+        unique_ids = list(dict.fromkeys(offer_ids))
+        semaphore = asyncio.Semaphore(BULK_OFFER_CONCURRENCY)
+        
+        async def fetch(client: DuffelClient, offer_id: str) -> Dict:
+            async with semaphore:
+                return await client.get_offer(offer_id=offer_id)
+        
+        async with _get_client() as client:
+            responses = await asyncio.gather(
+                *(fetch(client, offer_id) for offer_id in unique_ids),
+                return_exceptions=True
             )
-            return json.dumps(response, indent=2)
+        
+        # One entry per requested ID, in request order
+        by_id = dict(zip(unique_ids, responses))
+        return _dumps([
+            {'offer_id': offer_id, 'error': str(by_id[offer_id])} if isinstance(by_id[offer_id], BaseException)
+            else by_id[offer_id]
+            for offer_id in offer_ids
+        ])
             
     except Exception as e:
-        logger.error(f"Error getting offer details: {str(e)}", exc_info=True)
+        logger.error("Error getting offer details: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         raise
 
 @mcp.tool(name="search_multi_city")
 async def search_multi_city(params: MultiCityRequest) -> str:
     """Search for multi-city flights."""
     try:
-        slices = []
-        for segment in params.segments:
-            slices.append(_create_slice(
-                segment.origin,
-                segment.destination,
-                segment.departure_date,
-                None,
-                None
-            ))
+        async def search() -> str:
+            slices = [
+                _create_slice(segment["origin"], segment["destination"], segment["departure_date"])
+                for segment in params.segments
+            ]
 
-        # Use async context manager with shorter timeout
-        async with flight_client as client:
-            response = await client.create_offer_request(
-                slices=slices,
-                cabin_class=params.cabin_class,
-                adult_count=params.adults,
-                max_connections=params.max_connections,
-                return_offers=True,
-                supplier_timeout=30000  # Increased timeout for multi-city
-            )
+            # Use async context manager with increased timeout for multi-city
+            async with _get_client() as client:
+                response = await _search_cheapest(client, slices, params, limit=10, supplier_timeout=30000)
+            return _format_search_response(response, 10)
         
-            # Format response inside the context
-            formatted_response = {
-                'request_id': response['request_id'],
-                'offers': []
-            }
-            
-            # Process offers inside the context
-            for offer in response.get('offers', [])[:10]:
-                offer_details = {
-                    'offer_id': offer.get('id'),
-                    'price': {
-                        'amount': offer.get('total_amount'),
-                        'currency': offer.get('total_currency')
-                    },
-                    'slices': []
-                }
-                
-                for slice in offer.get('slices', []):
-                    segments = slice.get('segments', [])
-                    if segments:
-                        slice_details = {
-                            'origin': slice['origin']['iata_code'],
-                            'destination': slice['destination']['iata_code'],
-                            'departure': segments[0].get('departing_at'),
-                            'arrival': segments[-1].get('arriving_at'),
-                            'duration': slice.get('duration'),
-                            'carrier': segments[0].get('marketing_carrier', {}).get('name'),
-                            'stops': len(segments) - 1,
-                            'stops_description': 'Non-stop' if len(segments) == 1 else f'{len(segments) - 1} stop{"s" if len(segments) - 1 > 1 else ""}',
-                            'connections': []
-                        }
-                        
-                        if len(segments) > 1:
-                            for i in range(len(segments)-1):
-                                connection = {
-                                    'airport': segments[i].get('destination', {}).get('iata_code'),
-                                    'arrival': segments[i].get('arriving_at'),
-                                    'departure': segments[i+1].get('departing_at'),
-                                    'duration': segments[i+1].get('duration')
-                                }
-                                slice_details['connections'].append(connection)
-                        
-                        offer_details['slices'].append(slice_details)
-                
-                formatted_response['offers'].append(offer_details)
-            
-            return json.dumps(formatted_response, indent=2)
+        return await _cached_search(("search_multi_city", params.model_dump_json()), search)
             
     except Exception as e:
-        logger.error(f"Error searching flights: {str(e)}", exc_info=True)
+        logger.error("Error searching flights: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         raise
\ No newline at end of file
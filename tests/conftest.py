@@ -0,0 +1,35 @@
+"""Shared fixtures for offline tests."""
+
+import pytest
+import logging
+import httpx
+from flights.api import DuffelClient
+
+# Setup logging for tests
+logger = logging.getLogger(__name__)
+
+@pytest.fixture
+async def offline_client(monkeypatch):
+    """Factory for Duffel clients whose requests are answered by a handler.
+
+    Each call returns the client and the list of requests it sent. Every
+    client is closed, and the offer request cache cleared, on teardown.
+    """
+    monkeypatch.setenv("DUFFEL_API_KEY_LIVE", "duffel_test_offline")
+    clients = []
+
+    def make(handler):
+        seen = []
+
+        def record(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return handler(request)
+
+        client = DuffelClient(logger, transport=httpx.MockTransport(record))
+        clients.append(client)
+        return client, seen
+
+    yield make
+    for client in clients:
+        await client.aclose()
+    DuffelClient.clear_cache()
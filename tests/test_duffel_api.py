@@ -16,6 +16,8 @@ async def client():
     client = DuffelClient(logger)
     async with client as c:
         yield c
+    await client.aclose()
+    DuffelClient.clear_cache()
 
 @pytest.mark.asyncio
 async def test_search_one_way(client):
@@ -95,6 +97,21 @@ async def test_search_multi_city(client):
     assert "request_id" in response
     assert "offers" in response
 
+@pytest.mark.asyncio
+async def test_repeated_search_is_cached(client):
+    """Test that identical searches reuse the cached offer request."""
+    tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+    slices = [{
+        "origin": "SFO",
+        "destination": "LAX",
+        "departure_date": tomorrow
+    }]
+    
+    first = await client.create_offer_request(slices=slices, cabin_class="economy", adult_count=1)
+    second = await client.create_offer_request(slices=slices, cabin_class="economy", adult_count=1)
+    
+    assert first["request_id"] == second["request_id"]
+
 @pytest.mark.asyncio
 async def test_cabin_classes(client):
     """Test different cabin classes."""
@@ -144,6 +161,30 @@ async def test_get_offer(client):
     assert offer_details is not None
     assert "data" in offer_details
 
+@pytest.mark.asyncio
+async def test_list_offers(client):
+    """Test listing the cheapest offers of an offer request."""
+    tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+    
+    offer_request = await client.create_offer_request(
+        slices=[{
+            "origin": "SFO",
+            "destination": "LAX",
+            "departure_date": tomorrow
+        }],
+        cabin_class="economy",
+        adult_count=1,
+        return_offers=False
+    )
+    
+    assert offer_request["offers"] == []
+    
+    offers = await client.list_offers(offer_request["request_id"], limit=5)
+    
+    assert 0 < len(offers) <= 5
+    amounts = [float(offer["total_amount"]) for offer in offers]
+    assert amounts == sorted(amounts)
+
 @pytest.mark.asyncio
 async def test_error_handling(client):
     """Test error handling for invalid requests."""
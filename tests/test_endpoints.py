@@ -0,0 +1,92 @@
+"""Offline tests for Duffel API request retries."""
+
+import pytest
+import httpx
+from flights.api import endpoints
+
+@pytest.fixture
+def delays(monkeypatch):
+    """Record backoff sleeps instead of waiting, with jitter fixed at zero."""
+    slept = []
+
+    async def sleep(delay):
+        slept.append(delay)
+
+    monkeypatch.setattr(endpoints.asyncio, "sleep", sleep)
+    monkeypatch.setattr(endpoints.random, "uniform", lambda a, b: 0.0)
+    return slept
+
+@pytest.fixture
+def offer_endpoints(offline_client):
+    """Factory for endpoints whose requests are answered by `responses` in order; also returns the requests seen."""
+    def make(*responses: httpx.Response):
+        pending = iter(responses)
+        client, seen = offline_client(lambda request: next(pending))
+        return client.offers, seen
+
+    return make
+
+def test_backoff_delay_grows_and_is_capped(delays):
+    """Backoff doubles per attempt up to the maximum delay."""
+    assert endpoints._backoff_delay(0) == endpoints.RETRY_BASE_DELAY
+    assert endpoints._backoff_delay(2) == endpoints.RETRY_BASE_DELAY * 4
+    assert endpoints._backoff_delay(20) == endpoints.RETRY_MAX_DELAY
+
+def test_retry_after_parsing():
+    """Retry-After seconds are honoured, capped, and ignored when absent or not numeric."""
+    assert endpoints._retry_after(httpx.Response(429, headers={"Retry-After": "2"})) == 2.0
+    assert endpoints._retry_after(httpx.Response(429, headers={"Retry-After": "120"})) == endpoints.RETRY_MAX_DELAY
+    assert endpoints._retry_after(httpx.Response(429)) is None
+    assert endpoints._retry_after(
+        httpx.Response(429, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+    ) is None
+
+@pytest.mark.asyncio
+async def test_send_retries_service_unavailable(offer_endpoints, delays):
+    """A 503 is retried after backoff and the later success returned."""
+    offers, seen = offer_endpoints(httpx.Response(503), httpx.Response(200, json={"data": []}))
+
+    response = await offers._send("GET", "/offers")
+
+    assert response.status_code == 200
+    assert len(seen) == 2
+    assert delays == [endpoints.RETRY_BASE_DELAY]
+
+@pytest.mark.asyncio
+async def test_send_honours_capped_retry_after(offer_endpoints, delays):
+    """A 429 waits for its Retry-After, never longer than the maximum delay."""
+    offers, seen = offer_endpoints(
+        httpx.Response(429, headers={"Retry-After": "3"}),
+        httpx.Response(429, headers={"Retry-After": "120"}),
+        httpx.Response(200, json={"data": []})
+    )
+
+    response = await offers._send("GET", "/offers")
+
+    assert response.status_code == 200
+    assert len(seen) == 3
+    assert delays == [3.0, endpoints.RETRY_MAX_DELAY]
+
+@pytest.mark.asyncio
+async def test_send_raises_client_errors_immediately(offer_endpoints, delays):
+    """Non-retryable 4xx responses raise without a retry."""
+    offers, seen = offer_endpoints(httpx.Response(422), httpx.Response(200))
+
+    with pytest.raises(httpx.HTTPStatusError) as exc_info:
+        await offers._send("POST", "/offer_requests")
+
+    assert exc_info.value.response.status_code == 422
+    assert len(seen) == 1
+    assert delays == []
+
+@pytest.mark.asyncio
+async def test_send_reraises_after_last_attempt(offer_endpoints, delays):
+    """The final failure is re-raised once every attempt is used up."""
+    offers, seen = offer_endpoints(*(httpx.Response(502) for _ in range(endpoints.MAX_ATTEMPTS)))
+
+    with pytest.raises(httpx.HTTPStatusError) as exc_info:
+        await offers._send("GET", "/offers")
+
+    assert exc_info.value.response.status_code == 502
+    assert len(seen) == endpoints.MAX_ATTEMPTS
+    assert len(delays) == endpoints.MAX_ATTEMPTS - 1
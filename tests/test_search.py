@@ -0,0 +1,97 @@
+"""Offline tests for the flight search tools."""
+
+import pytest
+import logging
+import httpx
+import orjson
+from flights.models.search import MultiCityFlight, OneWayFlight
+from flights.services import search
+
+# Setup logging for tests
+logger = logging.getLogger(__name__)
+
+OFFER = {"id": "off_found", "total_amount": "100.00", "total_currency": "USD", "slices": []}
+
+def duffel(request: httpx.Request) -> httpx.Response:
+    """Answer offer requests, offer listings and lookups of OFFER; anything else is not found."""
+    if request.url.path == "/air/offers/off_found":
+        return httpx.Response(200, json={"data": OFFER})
+    if request.url.path == "/air/offer_requests":
+        return httpx.Response(201, json={"data": {"id": "orq_offline", "offers": []}})
+    if request.url.path == "/air/offers":
+        return httpx.Response(200, json={"data": [OFFER]})
+    return httpx.Response(404, json={"errors": [{"message": "Not found"}]})
+
+@pytest.fixture
+def served(offline_client, monkeypatch):
+    """Route the search tools' client through a mock transport; returns the requests it served."""
+    client, seen = offline_client(duffel)
+    monkeypatch.setattr(search, "_flight_client", client)
+    yield seen
+    search._SEARCH_CACHE.clear()
+
+@pytest.mark.asyncio
+async def test_offer_details_bulk_mixed_results(served):
+    """Failed lookups are reported in place without discarding the others."""
+    result = orjson.loads(
+        await search.get_offer_details_bulk(["off_found", "off_missing", "off_found"])
+    )
+
+    assert result[0] == {"data": OFFER}
+    assert result[1]["offer_id"] == "off_missing"
+    assert "404" in result[1]["error"]
+    assert result[2] == {"data": OFFER}
+    # The repeated ID is fetched only once
+    assert len(served) == 2
+
+@pytest.mark.asyncio
+async def test_repeated_search_served_from_cache(served):
+    """An identical search within the cache window makes no HTTP request."""
+    params = OneWayFlight(type="one_way", origin="SFO", destination="LAX", departure_date="2030-01-01")
+
+    first = await search.search_flights(params)
+    requests_made = len(served)
+    second = await search.search_flights(params)
+
+    assert requests_made == 2
+    assert len(served) == requests_made
+    assert second == first
+    assert orjson.loads(first)["request_id"] == "orq_offline"
+
+@pytest.mark.asyncio
+async def test_legs_priced_separately_are_not_cached(served):
+    """Per-leg searches always go upstream and leave the search cache untouched."""
+    params = MultiCityFlight(
+        type="multi_city", origin="SFO", destination="JFK", departure_date="2030-01-01",
+        additional_stops=[{"origin": "JFK", "destination": "LHR", "departure_date": "2030-01-05"}],
+        price_legs_separately=True
+    )
+
+    first = orjson.loads(await search.search_flights(params))
+    await search.search_flights(params)
+
+    assert [leg["request_id"] for leg in first["legs"]] == ["orq_offline", "orq_offline"]
+    # The repeat reuses the cached offer requests but lists their offers again
+    assert len(served) == 6
+    assert len(search._SEARCH_CACHE) == 0
+
+@pytest.mark.asyncio
+async def test_client_outlives_concurrent_sessions(monkeypatch):
+    """Ending one session leaves the shared client open for the others."""
+    monkeypatch.setenv("DUFFEL_API_KEY_LIVE", "duffel_test_offline")
+    monkeypatch.setattr(search, "_flight_client", None)
+    first_session = search._lifespan(search.mcp)
+    second_session = search._lifespan(search.mcp)
+
+    await first_session.__aenter__()
+    await second_session.__aenter__()
+    client = search._get_client()
+    await first_session.__aexit__(None, None, None)
+
+    assert search._get_client() is client
+    assert not client._http.is_closed
+
+    await second_session.__aexit__(None, None, None)
+
+    assert search._flight_client is None
+    assert client._http.is_closed